@@ -4,7 +4,7 @@ Interactive script to collect 4 corner points for all 6 painting images.
 This script will:
 1. Display each image one by one
 2. Allow you to click 4 corner points on each painting
-3. Save all corner points to 'painting_corners.npz'
+3. Save all corner points to 'painting_corners.npy' (and 'painting_corners.npz')
 
 Click the corners in this order for each image:
   1. Top-left corner
@@ -13,12 +13,36 @@ Click the corners in this order for each image:
   4. Bottom-left corner
 
 Usage:
-    python click_painting_corners.py
+    python click_painting_corners.py [--auto [--yes]] [--no-cache]
+
+With --auto, the painting outline is detected automatically and shown for
+confirmation (ENTER accepts, any other key falls back to clicking). Adding
+--yes accepts every detection without asking and runs the detection for all
+paintings in parallel worker processes; only images with no detected
+outline are left for clicking.
+
+Corner points are written to the memory-mapped 'painting_corners.npy' after
+every image, so an interrupted session can be resumed by running the script
+again and declining to overwrite.
+
+Decoded images are cached next to each JPEG as '<file>.cache.npy' so
+reruns skip the decode; pass --no-cache to always decode from the JPEG.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+import cv2
 import os
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Pool
+from PIL import Image
+from image_utils import WINDOW_FLAGS, load_image, fit_to_display
+
+# Banner line for console output
+SEP = "=" * 70
 
 # Painting dimensions (width, height) in centimeters
 # Column 0 → width in centimeters
@@ -43,7 +67,72 @@ image_files = [
 ]
 
 
-def click_corners(image_path, title="Click 4 corners"):
+def get_dims(image_path):
+    """
+    Read the (width, height) of an image without decoding its pixels.
+    
+    PIL only parses the file header here; EXIF orientations 5-8 are
+    rotated by 90 degrees, so width and height are swapped for them.
+    
+    Parameters:
+    -----------
+    image_path : str
+        Path to the image file
+    
+    Returns:
+    --------
+    (width, height) : tuple of int
+        Image size in pixels, as displayed
+    """
+    with Image.open(image_path) as im:
+        width, height = im.size
+        orientation = im.getexif().get(0x0112, 1)
+    if orientation in (5, 6, 7, 8):
+        width, height = height, width
+    return width, height
+
+
+def cached_read(image_path):
+    """
+    Load an image through a '<file>.cache.npy' sidecar of its decoded pixels.
+    
+    The cache is rebuilt whenever the image file is newer than it or it
+    cannot be read, and is otherwise memory-mapped read-only instead of
+    decoding the JPEG again.
+    
+    Parameters:
+    -----------
+    image_path : str
+        Path to the image file
+    
+    Returns:
+    --------
+    img : numpy array of shape (H, W, 3)
+        Decoded BGR image (read-only memmap on a cache hit)
+    """
+    cache = image_path + '.cache.npy'
+    if (os.path.exists(cache)
+            and os.path.getmtime(cache) >= os.path.getmtime(image_path)):
+        try:
+            return np.load(cache, mmap_mode='r')
+        except (OSError, ValueError, EOFError):
+            pass  # unreadable cache: rebuild it below
+    img = load_image(image_path)
+    
+    # Write to a temporary file and rename it into place, so an interrupted
+    # save never leaves a truncated cache behind
+    fd, tmp = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(os.path.abspath(cache)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, img, allow_pickle=False)
+        os.replace(tmp, cache)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return img
+
+
+def click_corners(image, title="Click 4 corners", window=None, rgb=False):
     """
     Display an image and collect 4 corner points by clicking.
     
@@ -55,123 +144,434 @@ def click_corners(image_path, title="Click 4 corners"):
     
     Parameters:
     -----------
-    image_path : str
-        Path to the image file
+    image : str, numpy array, PIL.Image.Image, bytes or bytearray
+        Path to the image file, a decoded image, or encoded file bytes (see load_image)
     title : str
         Title to display on the window
+    window : str or None
+        Name of a HighGUI window to reuse (created on first use). The
+        window is left open for the next image. If None, a window is
+        created and then destroyed when done
+    rgb : bool
+        Set to True when passing an RGB(A) array such as a plt.imread
+        result (see load_image)
     
     Returns:
     --------
-    corners : numpy array of shape (4, 2)
-        Corner points in order: [top-left, top-right, bottom-right, bottom-left]
+    corners : numpy array of shape (4, 2), float32
+        Corner points in original image pixels, in order:
+        [top-left, top-right, bottom-right, bottom-left]
     """
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image not found: {image_path}")
-    
-    img = plt.imread(image_path)
+    # Clicks happen on a screen-sized copy of the image
+    img, scale = fit_to_display(load_image(image, rgb=rgb))
     
-    fig, ax = plt.subplots(figsize=(12, 8))
-    ax.imshow(img)
-    ax.set_title(title, fontsize=16, fontweight='bold')
-    ax.axis('off')
+    # HighGUI window titles are single-line
+    owns_window = window is None
+    if owns_window:
+        window = title.split("\n")[0]
+    # namedWindow is a no-op when a reused window already exists
+    cv2.namedWindow(window, WINDOW_FLAGS)
+    cv2.setWindowTitle(window, title.split("\n")[0])
+    cv2.imshow(window, img)
     
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print(title)
-    print("="*70)
+    print(SEP)
     print("Click 4 corners of the painting in this order:")
     print("  1. Top-left corner")
     print("  2. Top-right corner")
     print("  3. Bottom-right corner")
     print("  4. Bottom-left corner")
-    print("Press ENTER when done")
-    print("="*70)
+    if owns_window:
+        print("The window closes after the 4th click")
+    else:
+        print("Clicking ends after the 4th click")
+    print(SEP)
+    
+    # Clicks are written straight into a preallocated array
+    corners = np.empty((4, 2), dtype=np.float32)
+    n_clicked = 0
+    
+    def on_click(event, x, y, flags, param):
+        nonlocal n_clicked
+        if event == cv2.EVENT_LBUTTONDOWN and n_clicked < 4:
+            corners[n_clicked] = (x, y)
+            n_clicked += 1
+            cv2.circle(img, (x, y), 5, (0, 0, 255), -1)
+            cv2.imshow(window, img)
     
-    points = plt.ginput(n=4, timeout=0, show_clicks=True)
-    plt.close(fig)
+    cv2.setMouseCallback(window, on_click)
+    while n_clicked < 4:
+        cv2.waitKey(20)
+        if cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) < 1:
+            raise RuntimeError(f"Window closed after {n_clicked}/4 corners")
+    if owns_window:
+        cv2.destroyWindow(window)
     
-    corners = np.array(points)
-    print(f"✓ Collected 4 corners from {image_path}")
+    # Map display coordinates back to the original image
+    corners /= scale
+    source = image if isinstance(image, str) else "image"
+    print(f"✓ Collected 4 corners from {source}")
     return corners
 
 
+def order_corners(quad):
+    """
+    Order 4 points as [top-left, top-right, bottom-right, bottom-left].
+    
+    The points are sorted by angle around their centroid (clockwise on
+    screen, since y points down), then rotated so the top edge (the one
+    with the smallest mean y) runs from the first point to the second.
+    Unlike picking each corner by its own argmin/argmax, this never uses
+    the same vertex twice, even for a strongly tilted painting.
+    
+    Parameters:
+    -----------
+    quad : numpy array of shape (4, 2)
+        Corner points in any order
+    
+    Returns:
+    --------
+    corners : numpy array of shape (4, 2), or None
+        None if the points are not 4 distinct vertices of a convex
+        quadrilateral
+    """
+    quad = np.asarray(quad, dtype=np.float64).reshape(4, 2)
+    if len(np.unique(quad, axis=0)) < 4:
+        return None
+    dx, dy = (quad - quad.mean(axis=0)).T
+    quad = quad[np.argsort(np.arctan2(dy, dx))]
+    # Start at the vertex whose clockwise edge is the topmost one
+    edge_y = quad[:, 1] + np.roll(quad[:, 1], -1)
+    quad = np.roll(quad, -np.argmin(edge_y), axis=0)
+    if not cv2.isContourConvex(quad.astype(np.float32).reshape(-1, 1, 2)):
+        return None
+    return quad
+
+
+def detect_corners(image, min_area=0.1, rgb=False):
+    """
+    Detect the 4 corners of a painting from its outline.
+    
+    Runs Canny on a display-sized grayscale copy, then takes the largest
+    external contour that simplifies to a convex quadrilateral.
+    
+    Parameters:
+    -----------
+    image : str, numpy array, PIL.Image.Image, bytes or bytearray
+        Path to the image file, a decoded image, or encoded file bytes (see load_image)
+    min_area : float
+        Smallest accepted quadrilateral, as a fraction of the image area
+    rgb : bool
+        Set to True when passing an RGB(A) array such as a plt.imread
+        result (see load_image)
+    
+    Returns:
+    --------
+    corners : numpy array of shape (4, 2), or None
+        Corner points in original image pixels, in order
+        [top-left, top-right, bottom-right, bottom-left];
+        None if no quadrilateral was found
+    """
+    img, scale = fit_to_display(load_image(image, rgb=rgb))
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.Canny(gray, 50, 150)
+    # Close small gaps in the frame edge so it forms one contour
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    min_px = min_area * img.shape[0] * img.shape[1]
+    for c in sorted(contours, key=cv2.contourArea, reverse=True):
+        if cv2.contourArea(c) < min_px:
+            break
+        approx = cv2.approxPolyDP(c, 0.02 * cv2.arcLength(c, True), True)
+        if len(approx) != 4 or not cv2.isContourConvex(approx):
+            continue
+        corners = order_corners(approx)
+        if corners is not None:
+            return corners / scale
+    return None
+
+
+def auto_detect_corners(image_path, use_cache=True):
+    """
+    Load an image file and detect its corners; used by the --auto --yes pool.
+    
+    Parameters:
+    -----------
+    image_path : str
+        Path to the image file
+    use_cache : bool
+        Read through the '.cache.npy' sidecar (see cached_read)
+    
+    Returns:
+    --------
+    corners : numpy array of shape (4, 2), or None
+        See detect_corners
+    """
+    img = cached_read(image_path) if use_cache else load_image(image_path)
+    return detect_corners(img)
+
+
+def confirm_corners(image, corners, title="Confirm corners", window=None, rgb=False):
+    """
+    Show detected corners on the image and ask the user to accept them.
+    
+    Parameters:
+    -----------
+    image : str, numpy array, PIL.Image.Image, bytes or bytearray
+        Path to the image file, a decoded image, or encoded file bytes (see load_image)
+    corners : numpy array of shape (4, 2)
+        Corner points in original image pixels
+    title : str
+        Title to display on the window
+    window : str or None
+        Name of an existing HighGUI window to reuse (see click_corners)
+    rgb : bool
+        Set to True when passing an RGB(A) array such as a plt.imread
+        result (see load_image)
+    
+    Returns:
+    --------
+    accepted : bool
+        True if ENTER was pressed, False for any other key
+    
+    Raises:
+    -------
+    RuntimeError
+        If the window is closed instead, as click_corners does
+    """
+    img, scale = fit_to_display(load_image(image, rgb=rgb))
+    pts = np.round(corners * scale).astype(np.int32)
+    cv2.polylines(img, [pts], True, (0, 255, 0), 2)
+    for p in pts:
+        cv2.circle(img, tuple(int(v) for v in p), 5, (0, 0, 255), -1)
+    
+    owns_window = window is None
+    if owns_window:
+        window = title.split("\n")[0]
+    # namedWindow is a no-op when a reused window already exists
+    cv2.namedWindow(window, WINDOW_FLAGS)
+    cv2.setWindowTitle(window, title.split("\n")[0])
+    cv2.imshow(window, img)
+    
+    print("Detected corners shown in green.")
+    print("Press ENTER to accept, or any other key to click them manually")
+    key = -1
+    while key == -1:
+        key = cv2.waitKey(20)
+        if cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) < 1:
+            raise RuntimeError("Window closed before the corners were confirmed")
+    if owns_window:
+        cv2.destroyWindow(window)
+    return key & 0xFF in (10, 13)
+
+
+def prompt(message, window=None):
+    """
+    Wait for ENTER in the terminal while keeping a HighGUI window responsive.
+    
+    input() blocks the main thread, and a HighGUI window that nobody calls
+    waitKey for stops repainting (some desktops flag it "not responding"),
+    so the prompt is read on a helper thread while this one pumps events.
+    
+    Parameters:
+    -----------
+    message : str
+        Prompt to print
+    window : str or None
+        HighGUI window to keep alive; if None, this is a plain input()
+    
+    Returns:
+    --------
+    response : str
+        The line typed by the user ('' if stdin was closed)
+    """
+    response = []
+    
+    def read():
+        try:
+            response.append(input(message))
+        except EOFError:
+            response.append('')
+    
+    if window is None:
+        read()
+        return response[0]
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    while reader.is_alive():
+        cv2.waitKey(50)
+    return response[0] if response else ''
+
+
 def main():
     """Main function to collect corner points for all 6 paintings."""
     
-    print("\n" + "="*70)
+    parser = argparse.ArgumentParser(description="Click 4 corners on each of the 6 paintings.")
+    parser.add_argument('--auto', action='store_true',
+                        help="detect corners automatically and only ask for confirmation")
+    parser.add_argument('--yes', action='store_true',
+                        help="with --auto, accept detections without confirmation (runs in parallel)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="decode every JPEG instead of using '<file>.cache.npy'")
+    args = parser.parse_args()
+    if args.yes and not args.auto:
+        parser.error("--yes requires --auto")
+    read_image = load_image if args.no_cache else cached_read
+    
+    print("\n" + SEP)
     print("PAINTING CORNER POINT COLLECTION")
-    print("="*70)
+    print(SEP)
     print("\nThis script will help you click 4 corner points on each of the 6 painting images.")
     print("\nFor each image, click the corners in this order:")
     print("  1. Top-left corner of the painting")
     print("  2. Top-right corner of the painting")
     print("  3. Bottom-right corner of the painting")
     print("  4. Bottom-left corner of the painting")
-    print("\n" + "="*70)
+    print("\n" + SEP)
+    
+    # Corners are streamed into a memory-mapped (6, 4, 2) .npy as each image
+    # is finished; rows that are still NaN have not been collected yet
+    output_file = 'painting_corners.npy'
+    shape = (len(image_files), 4, 2)
+    resume = False
+    if os.path.exists(output_file) or os.path.exists('painting_corners.npz'):
+        response = input("\n⚠ Saved corner points already exist. Overwrite? (y = start over, n = resume): ")
+        resume = response.lower() != 'y'
     
-    # Check if corner points already exist
-    if os.path.exists('painting_corners.npz'):
-        response = input("\n⚠ 'painting_corners.npz' already exists. Overwrite? (y/n): ")
-        if response.lower() != 'y':
-            print("Exiting without overwriting.")
-            return
+    if resume and os.path.exists(output_file):
+        mm = np.lib.format.open_memmap(output_file, mode='r+')
+        if mm.shape != shape or mm.dtype != np.float64:
+            raise ValueError(f"{output_file} has shape {mm.shape} and dtype {mm.dtype}, "
+                             f"expected {shape} float64")
+        rows = mm
+    else:
+        # The memmap is only created (truncating any previous .npy) once the
+        # first new image is stored, so starting over and quitting straight
+        # away keeps the old result
+        mm = None
+        rows = np.full(shape, np.nan)
+        # Sessions saved before the .npy existed only have the .npz
+        if resume:
+            with np.load('painting_corners.npz', allow_pickle=False) as data:
+                for k in data.files:
+                    rows[int(k.split('_')[1])] = data[k]
+    
+    def store(i, corners):
+        """Write one image's corners to the .npy and flush it to disk."""
+        nonlocal mm, rows
+        if mm is None:
+            mm = np.lib.format.open_memmap(output_file, mode='w+', dtype=np.float64, shape=shape)
+            mm[:] = rows
+            rows = mm
+        mm[i] = corners
+        mm.flush()
     
     # Store corner points for each image
-    corner_points = {}
-    
-    # Process each image
-    for i, img_file in enumerate(image_files):
-        width_cm, height_cm = paintings_wh[i]
-        
-        print(f"\n{'='*70}")
-        print(f"Image {i+1}/6: {img_file}")
-        print(f"Painting dimensions: {width_cm:.1f}cm × {height_cm:.1f}cm")
-        print(f"Aspect ratio: {width_cm/height_cm:.3f}")
-        print(f"{'='*70}")
-        
-        input(f"\nPress Enter to start clicking points on {img_file}...")
-        
-        # Click corners
-        title = f"Image {i+1} - {img_file}\nClick 4 corners (Top-left, Top-right, Bottom-right, Bottom-left)"
-        corners = click_corners(img_file, title)
-        corner_points[i] = corners
-        
-        # Display collected points
-        print(f"\nCollected points for Image {i+1}:")
-        labels = ['Top-left', 'Top-right', 'Bottom-right', 'Bottom-left']
-        for j, (label, point) in enumerate(zip(labels, corners)):
-            print(f"  {label}: ({point[0]:.2f}, {point[1]:.2f})")
-    
-    # Save all corner points to file
-    output_file = 'painting_corners.npz'
-    np.savez(output_file,
-             corners_0=corner_points[0],
-             corners_1=corner_points[1],
-             corners_2=corner_points[2],
-             corners_3=corner_points[3],
-             corners_4=corner_points[4],
-             corners_5=corner_points[5])
+    corner_points = {i: np.array(rows[i]) for i in range(len(image_files))
+                     if not np.isnan(rows[i]).any()}
+    if resume:
+        print(f"Resuming: {len(corner_points)}/6 images already done.")
+    todo = [i for i in range(len(image_files)) if i not in corner_points]
+    
+    # Non-interactive auto mode: every painting is independent, so decode and
+    # detect them in parallel worker processes
+    if args.yes and todo:
+        detect = partial(auto_detect_corners, use_cache=not args.no_cache)
+        with Pool(min(len(todo), os.cpu_count() or 1)) as p:
+            results = p.map(detect, [image_files[i] for i in todo])
+        for i, corners in zip(todo, results):
+            # Nobody confirms these, so re-check the quad before storing it
+            if corners is not None:
+                corners = order_corners(corners)
+            if corners is None:
+                print(f"⚠ No painting outline found in {image_files[i]}, it will be clicked manually")
+            else:
+                corner_points[i] = corners
+                store(i, corners)
+        todo = [i for i in todo if i not in corner_points]
+    
+    # One window is reused for all 6 paintings rather than rebuilt per image.
+    # It is created when the first clicking starts, so none is needed (or
+    # available, on headless OpenCV) if nothing is left
+    window = "Painting corners"
+    
+    # Process each image, decoding the next two in the background while
+    # the current one is being clicked (cv2 releases the GIL while decoding)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {i: pool.submit(read_image, image_files[i]) for i in todo[:2]}
+        for n, i in enumerate(todo):
+            img_file = image_files[i]
+            width_cm, height_cm = paintings_wh[i]
+            width_px, height_px = get_dims(img_file)
+            
+            print(f"\n{SEP}")
+            print(f"Image {i+1}/6: {img_file}")
+            print(f"Painting dimensions: {width_cm:.1f}cm × {height_cm:.1f}cm")
+            print(f"Aspect ratio: {width_cm/height_cm:.3f}")
+            print(f"Image size: {width_px} × {height_px} px (aspect {width_px/height_px:.3f})")
+            print(f"{SEP}")
+            
+            # The window only exists once the first image has been clicked
+            prompt(f"\nPress Enter to start clicking points on {img_file}...",
+                   window if n > 0 else None)
+            
+            # Click corners
+            title = f"Image {i+1} - {img_file}\nClick 4 corners (Top-left, Top-right, Bottom-right, Bottom-left)"
+            img = futures.pop(i).result()
+            if n + 2 < len(todo):
+                futures[todo[n + 2]] = pool.submit(read_image, image_files[todo[n + 2]])
+            corners = None
+            # With --yes, every image left here already failed detection in
+            # the pool, so go straight to clicking instead of detecting again
+            if args.auto and not args.yes:
+                corners = detect_corners(img)
+                if corners is None:
+                    print("⚠ No painting outline found, falling back to clicking")
+                elif not confirm_corners(img, corners, f"Image {i+1} - {img_file}", window=window):
+                    corners = None
+            if corners is None:
+                corners = click_corners(img, title, window=window)
+            corner_points[i] = corners
+            
+            # Save after every image so an interrupted session can resume
+            store(i, corners)
+            
+            # Display collected points
+            print(f"\nCollected points for Image {i+1}:")
+            labels = ['Top-left', 'Top-right', 'Bottom-right', 'Bottom-left']
+            print("\n".join(f"  {label}: ({x:.2f}, {y:.2f})"
+                            for label, (x, y) in zip(labels, corners)))
+    
+    if todo:
+        cv2.destroyWindow(window)
+    
+    # The .npy is already complete; keep the per-image .npz for notebooks
+    # that load it by key
+    if mm is None:
+        # Resumed from a legacy .npz with nothing left to do
+        np.save(output_file, rows, allow_pickle=False)
+    corner_points = {i: np.array(rows[i]) for i in range(len(image_files))}
+    del mm, rows
+    np.savez('painting_corners.npz',
+             **{f'corners_{i}': corner_points[i] for i in range(len(image_files))})
     
     # Display summary
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print("ALL CORNER POINTS COLLECTED SUCCESSFULLY!")
-    print("="*70)
-    print(f"\nPoints saved to: {output_file}")
+    print(SEP)
+    print(f"\nPoints saved to: {output_file} (and painting_corners.npz)")
     print("\nSummary:")
     for i in range(6):
         print(f"  Image {i+1} ({image_files[i]}): {len(corner_points[i])} points")
     
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print("To load these points in your notebook, use:")
-    print("  data = np.load('painting_corners.npz')")
-    print("  corner_points = {")
-    print("      0: data['corners_0'],")
-    print("      1: data['corners_1'],")
-    print("      2: data['corners_2'],")
-    print("      3: data['corners_3'],")
-    print("      4: data['corners_4'],")
-    print("      5: data['corners_5']")
-    print("  }")
-    print("="*70)
+    print("  arr = np.load('painting_corners.npy', allow_pickle=False)")
+    print("  corner_points = {i: arr[i] for i in range(6)}")
+    print(SEP)
 
 
 if __name__ == "__main__":
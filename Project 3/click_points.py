@@ -8,65 +8,136 @@ Usage:
 The script will:
 1. Display image_3.png and let you click points
 2. Display image_4.png and let you click corresponding points
-3. Save the points to 'correspondence_points.npz' file
+3. Save the points to 'image1points.npy' and 'image2points.npy'
+   (plus 'correspondence_points.npz' for notebooks that load it)
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import os
+import cv2
+import struct
+import zipfile
+from image_utils import WINDOW_FLAGS, load_image, fit_to_display
 
-def click_points_on_image(image_path, title, min_points=4):
+# Banner line for console output
+SEP = "=" * 70
+
+
+def load_from_npz(npz_path, key):
+    """
+    Read a single array from an uncompressed .npz without np.load.
+    
+    np.savez stores members uncompressed, so the array can be parsed
+    straight from the archive's file object instead of going through
+    the per-member zf.open wrapper that np.load uses.
+    
+    Parameters:
+    -----------
+    npz_path : str
+        Path to the .npz file
+    key : str
+        Name of the array (e.g. 'image1points')
+    
+    Returns:
+    --------
+    array : numpy array
+    """
+    with zipfile.ZipFile(npz_path) as zf:
+        info = zf.getinfo(key + '.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            with zf.open(info) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+        # Skip the local file header: 30 fixed bytes + name + extra field
+        zf.fp.seek(info.header_offset)
+        header = zf.fp.read(30)
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        zf.fp.seek(info.header_offset + 30 + name_len + extra_len)
+        return np.lib.format.read_array(zf.fp, allow_pickle=False)
+
+
+def click_points_on_image(image, title, min_points=4, rgb=False):
     """
     Display an image and collect points by clicking.
     
     Parameters:
     -----------
-    image_path : str
-        Path to the image file
+    image : str, numpy array, PIL.Image.Image, bytes or bytearray
+        Path to the image file, a decoded image, or encoded file bytes (see load_image)
     title : str
         Title to display on the window
     min_points : int
         Minimum number of points required
+    rgb : bool
+        Set to True when passing an RGB(A) array such as a plt.imread
+        result (see load_image)
     
     Returns:
     --------
     points : list of tuples
-        List of (x, y) coordinates
+        List of (x, y) coordinates in original image pixels
     """
-    # Load image
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image not found: {image_path}")
+    # Load image; clicks happen on a screen-sized copy
+    img = load_image(image, rgb=rgb)
+    disp, scale = fit_to_display(img)
     
-    img = plt.imread(image_path)
-    
-    # Display image
-    fig, ax = plt.subplots(figsize=(12, 8))
-    ax.imshow(img)
-    ax.set_title(title, fontsize=16, fontweight='bold')
-    ax.axis('off')
+    # Display image (HighGUI window titles are single-line)
+    window = title.split("\n")[0]
+    cv2.namedWindow(window, WINDOW_FLAGS)
+    cv2.imshow(window, disp)
     
     # Instructions
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print(title)
-    print("="*70)
+    print(SEP)
     print(f"Instructions:")
     print(f"  - Left-click to select points (at least {min_points} points)")
     print(f"  - Points will be marked with red crosses as you click")
     print(f"  - Press ENTER when you're done selecting points")
     print(f"  - Right-click to remove the last point")
-    print("="*70)
-    
-    # Collect points
-    points = plt.ginput(n=-1, timeout=0, show_clicks=True)
+    print(SEP)
+    
+    points = []
+    
+    # Markers are drawn onto a canvas copied once from the clean image, so a
+    # click only touches the pixels under its marker instead of the full frame
+    canvas = disp.copy()
+    marker_size, marker_thickness = 12, 2
+    r = marker_size // 2 + marker_thickness
+    
+    def draw_marker(p):
+        cv2.drawMarker(canvas, p, (0, 0, 255), cv2.MARKER_CROSS,
+                       marker_size, marker_thickness)
+    
+    def on_click(event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN:
+            points.append((x, y))
+            draw_marker((x, y))
+            cv2.imshow(window, canvas)
+        elif event == cv2.EVENT_RBUTTONDOWN and points:
+            # Restore the removed marker's patch from the clean image, then
+            # redraw the remaining markers in case any overlapped it
+            px, py = points.pop()
+            y0, y1 = max(py - r, 0), py + r + 1
+            x0, x1 = max(px - r, 0), px + r + 1
+            canvas[y0:y1, x0:x1] = disp[y0:y1, x0:x1]
+            for p in points:
+                draw_marker(p)
+            cv2.imshow(window, canvas)
+    
+    # Collect points until ENTER
+    cv2.setMouseCallback(window, on_click)
+    while cv2.waitKey(20) & 0xFF not in (10, 13):
+        if cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) < 1:
+            break
+    cv2.destroyWindow(window)
     
     # Validate minimum points
     if len(points) < min_points:
         raise ValueError(f"Need at least {min_points} points, but only got {len(points)}")
     
-    plt.close(fig)
-    
-    print(f"\n✓ Collected {len(points)} points from {image_path}")
-    return points
+    source = image if isinstance(image, str) else "image"
+    print(f"\n✓ Collected {len(points)} points from {source}")
+    # Map display coordinates back to the original image
+    return [(x / scale, y / scale) for x, y in points]
 
 
 def main():
@@ -76,9 +147,9 @@ def main():
     img1_path = 'image_3.png'
     img2_path = 'image_4.png'
     
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print("IMAGE CORRESPONDENCE POINT CLICKING")
-    print("="*70)
+    print(SEP)
     print("\nThis script will help you select corresponding points on two images.")
     print("You'll click points on Image 3 first, then corresponding points on Image 4.")
     print("\nIMPORTANT:")
@@ -86,7 +157,7 @@ def main():
     print("  - Click corresponding points in the SAME ORDER on both images")
     print("  - Example: if you click the top-left corner first on Image 3,")
     print("    click the top-left corner first on Image 4 too")
-    print("="*70)
+    print(SEP)
     
     input("\nPress Enter to start clicking points on Image 3...")
     
@@ -121,35 +192,42 @@ def main():
         points_img2 = points_img2[:n_points]
     
     # Convert to numpy arrays
-    image1points = np.array(points_img1)
-    image2points = np.array(points_img2)
+    image1points = np.array(points_img1, dtype=np.float64)
+    image2points = np.array(points_img2, dtype=np.float64)
+    
+    # Save points to file; raw .npy loads without any zip overhead
+    np.save('image1points.npy', image1points, allow_pickle=False)
+    np.save('image2points.npy', image2points, allow_pickle=False)
     
-    # Save points to file
+    # Keep the combined .npz for the project notebooks
     output_file = 'correspondence_points.npz'
     np.savez(output_file, 
              image1points=image1points, 
              image2points=image2points)
     
     # Display results
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print("POINTS COLLECTED SUCCESSFULLY!")
-    print("="*70)
+    print(SEP)
     print(f"\nTotal correspondences: {len(image1points)}")
-    print(f"\nPoints saved to: {output_file}")
+    print(f"\nPoints saved to: image1points.npy, image2points.npy and {output_file}")
     print("\nImage 3 points:")
-    for i, (x, y) in enumerate(image1points, 1):
-        print(f"  Point {i}: ({x:.2f}, {y:.2f})")
+    print("\n".join(f"  Point {i}: ({x:.2f}, {y:.2f})"
+                    for i, (x, y) in enumerate(image1points, 1)))
     
     print("\nImage 4 points:")
-    for i, (x, y) in enumerate(image2points, 1):
-        print(f"  Point {i}: ({x:.2f}, {y:.2f})")
+    print("\n".join(f"  Point {i}: ({x:.2f}, {y:.2f})"
+                    for i, (x, y) in enumerate(image2points, 1)))
     
-    print("\n" + "="*70)
+    print("\n" + SEP)
     print("To use these points in your notebook, run:")
-    print("  data = np.load('correspondence_points.npz')")
-    print("  image1points = data['image1points']")
-    print("  image2points = data['image2points']")
-    print("="*70)
+    print("  image1points = np.load('image1points.npy', allow_pickle=False)")
+    print("  image2points = np.load('image2points.npy', allow_pickle=False)")
+    print("or, from the single .npz file:")
+    print("  from click_points import load_from_npz")
+    print("  image1points = load_from_npz('correspondence_points.npz', 'image1points')")
+    print("  image2points = load_from_npz('correspondence_points.npz', 'image2points')")
+    print(SEP)
     
     # Also print as arrays for easy copying
     print("\nAs numpy arrays (for copying into notebook):")
@@ -0,0 +1,107 @@
+"""
+Image loading and display helpers shared by the point-clicking scripts.
+
+Used by click_points.py and click_painting_corners.py:
+- load_image: turn a path, array, PIL image or encoded bytes into a BGR array
+- fit_to_display: shrink an image to the on-screen size used for clicking
+"""
+
+import numpy as np
+import cv2
+import os
+from PIL import Image
+
+# HighGUI window flags: resizable, aspect-locked, and without the Qt
+# toolbar/status bar (WINDOW_GUI_NORMAL), which keeps window creation light
+WINDOW_FLAGS = cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO | cv2.WINDOW_GUI_NORMAL
+
+# Largest (width, height) shown on screen: 12x8 inches at 100 dpi
+DISPLAY_SIZE = (1200, 800)
+
+
+def load_image(image, rgb=False):
+    """
+    Return a BGR uint8 array for display from a path, array, PIL image or bytes.
+    
+    Parameters:
+    -----------
+    image : str, numpy array, PIL.Image.Image, bytes or bytearray
+        Path to the image file, an already-decoded array, a PIL image, or
+        encoded file contents (e.g. a JPEG downloaded or produced in memory).
+        Arrays may be grayscale, 3-channel or 4-channel (alpha is dropped),
+        either uint8 or float in [0, 1] as returned by plt.imread
+    rgb : bool
+        Array input only: True if its channels are RGB(A), as from
+        plt.imread; False (default) if they are BGR(A), as from cv2.imread
+    
+    Returns:
+    --------
+    img : numpy array of shape (H, W, 3), uint8
+        A private copy that is safe to draw on
+    """
+    if isinstance(image, np.ndarray):
+        img = image
+        if img.ndim not in (2, 3) or (img.ndim == 3 and img.shape[2] not in (1, 3, 4)):
+            raise ValueError(f"Unsupported image array shape {img.shape}; "
+                             "expected (H, W), (H, W, 3) or (H, W, 4)")
+        if img.dtype == np.uint8:
+            img = img.copy()
+        elif np.issubdtype(img.dtype, np.floating):
+            img = (np.clip(img, 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+        else:
+            raise ValueError(f"Unsupported image dtype {img.dtype}; "
+                             "expected uint8 or float in [0, 1]")
+        if img.ndim == 3 and img.shape[2] == 1:
+            img = img[:, :, 0]
+        if img.ndim == 3:
+            if img.shape[2] == 4:
+                img = np.ascontiguousarray(img[:, :, :3])
+            if rgb:
+                img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    elif isinstance(image, Image.Image):
+        img = cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2BGR)
+    elif isinstance(image, (bytes, bytearray)):
+        img = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("Could not decode image bytes")
+    else:
+        if not os.path.exists(image):
+            raise FileNotFoundError(f"Image not found: {image}")
+        # cv2.imread cannot open non-ASCII paths on Windows (the painting
+        # file names contain '—' and 'ó'), so read the bytes and decode them
+        img = cv2.imdecode(np.fromfile(image, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError(f"Could not decode image: {image}")
+    if img.ndim == 2:
+        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    return img
+
+
+def fit_to_display(img):
+    """
+    Shrink an image to fit the display area for interactive clicking.
+    
+    Large images are resized with INTER_AREA so the window only has to
+    render screen-sized frames; images that already fit are returned as is.
+    
+    Parameters:
+    -----------
+    img : numpy array
+        Full-resolution image
+    
+    Returns:
+    --------
+    disp : numpy array
+        Image to display
+    scale : float
+        Display-to-original scale factor (<= 1); divide clicked
+        coordinates by it to get original pixel coordinates
+    """
+    h0, w0 = img.shape[:2]
+    max_w, max_h = DISPLAY_SIZE
+    scale = min(max_w / w0, max_h / h0, 1.0)
+    if scale == 1.0:
+        return img, scale
+    disp = cv2.resize(img, (int(w0 * scale), int(h0 * scale)),
+                      interpolation=cv2.INTER_AREA)
+    return disp, scale